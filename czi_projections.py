@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+#################################################################
+# File        : czi_projections.py
+# Author      : sebi06
+#
+# Disclaimer: This tool is purely experimental. Feel free to
+# use it at your own risk.
+#
+#################################################################
+
+import os
+from collections import OrderedDict
+import numpy as np
+from pylibCZIrw import czi as pyczi
+
+# allowed projection methods and axes
+PROJECTION_METHODS = ['MIP', 'Mean', 'Sum']
+PROJECTION_AXES = ['Z', 'T']
+PROJECTION_DIMSTRING = 'STZCYX'
+
+# cached projections - key = (filepath, mtime, axis, method)
+# only the most recently used results are kept to bound the memory
+PROJECTION_CACHE_SIZE = 4
+_projection_cache = OrderedDict()
+
+
+def clear_projection_cache():
+    """Remove all cached projections.
+    """
+
+    _projection_cache.clear()
+
+
+def _readonly(array):
+    """Return a read-only view of an array, so the cached projections
+    cannot be modified through napari layers.
+    """
+
+    view = array.view()
+    view.flags.writeable = False
+
+    return view
+
+
+def _stz(array, axis):
+    """Insert the projected axis as size 1 dimension, so an array with
+    dimension order S(T|Z)CYX becomes STZCYX.
+    """
+
+    return np.expand_dims(array, 2 if axis == 'Z' else 1)
+
+
+def iter_project_czi(filepath, axis='Z', method='MIP'):
+    """Calculate a projection along the Z or T axis of a CZI by reading
+    it plane-by-plane. Only the result array and the current 2D plane are
+    kept in memory, so the full stack is never materialized. For 'Mean' one
+    additional buffer of the result size is used for the partial results.
+    The last results are cached per file, axis and method.
+
+    After every completed pass along the projection axis a read-only partial
+    result is yielded, so the generator can be used with a napari thread_worker.
+    The last yielded array is the final projection.
+
+    :param filepath: filepath of the CZI image
+    :type filepath: str
+    :param axis: dimension to project along, either 'Z' or 'T', defaults to 'Z'
+    :type axis: str, optional
+    :param method: projection method, either 'MIP', 'Mean' or 'Sum', defaults to 'MIP'
+    :type method: str, optional
+    :yield: read-only (partial) projection with dimension order STZCYX, where the
+    projected axis has size 1, the number of finished passes and the total number of passes
+    :rtype: tuple(np.ndarray, int, int)
+    """
+
+    if axis not in PROJECTION_AXES:
+        raise ValueError('Projection axis must be one of ' + str(PROJECTION_AXES))
+    if method not in PROJECTION_METHODS:
+        raise ValueError('Projection method must be one of ' + str(PROJECTION_METHODS))
+
+    # the remaining (not projected) stack dimension
+    other = 'T' if axis == 'Z' else 'Z'
+
+    key = (os.path.abspath(filepath), os.path.getmtime(filepath), axis, method)
+    if key in _projection_cache:
+        _projection_cache.move_to_end(key)
+        yield _projection_cache[key], 1, 1
+        return
+
+    with pyczi.open_czi(filepath) as czidoc:
+
+        # missing dimensions are treated as size 1
+        bbox = czidoc.total_bounding_box
+        ranges = {dim: range(*bbox[dim]) if dim in bbox else range(0, 1)
+                  for dim in ['T', 'Z', 'C']}
+
+        # use the bounding box of the 1st scene for all scenes
+        scenes = sorted(czidoc.scenes_bounding_rectangle.keys())
+        if scenes:
+            rects = [czidoc.scenes_bounding_rectangle[s] for s in scenes]
+        else:
+            scenes = [None]
+            rects = [czidoc.total_bounding_rectangle]
+        width, height = rects[0].w, rects[0].h
+
+        total = len(ranges[axis])
+        result = None
+        buffer = None
+
+        for k, k_index in enumerate(ranges[axis]):
+            for s, scene in enumerate(scenes):
+                for o, o_index in enumerate(ranges[other]):
+                    for c, c_index in enumerate(ranges['C']):
+
+                        plane = czidoc.read(plane={axis: k_index, other: o_index, 'C': c_index},
+                                            scene=scene,
+                                            roi=(rects[s].x, rects[s].y, width, height))
+
+                        # remove the A dimension for grayscale images
+                        if plane.shape[-1] == 1:
+                            plane = plane[..., 0]
+
+                        if result is None:
+                            dtype = plane.dtype if method == 'MIP' else np.float64
+                            result = np.zeros((len(scenes), len(ranges[other]), len(ranges['C'])) + plane.shape,
+                                              dtype=dtype)
+
+                        # reduce the current plane into the result in-place
+                        if method == 'MIP':
+                            if k == 0:
+                                result[s, o, c] = plane
+                            else:
+                                np.maximum(result[s, o, c], plane, out=result[s, o, c])
+                        else:
+                            np.add(result[s, o, c], plane, out=result[s, o, c])
+
+            if k == total - 1:
+                break
+
+            if method == 'Mean':
+                # reuse one buffer for the partial means
+                if buffer is None:
+                    buffer = np.empty_like(result)
+                np.divide(result, k + 1, out=buffer)
+                yield _readonly(_stz(buffer, axis)), k + 1, total
+            else:
+                yield _readonly(_stz(result, axis)), k + 1, total
+
+    if method == 'Mean':
+        result /= total
+
+    result = _readonly(_stz(result, axis))
+
+    _projection_cache[key] = result
+    while len(_projection_cache) > PROJECTION_CACHE_SIZE:
+        _projection_cache.popitem(last=False)
+
+    yield result, total, total
+
+
+def project_czi(filepath, axis='Z', method='MIP', callback=None):
+    """Calculate a projection along the Z or T axis of a CZI by reading
+    it plane-by-plane, see iter_project_czi.
+
+    :param filepath: filepath of the CZI image
+    :type filepath: str
+    :param axis: dimension to project along, either 'Z' or 'T', defaults to 'Z'
+    :type axis: str, optional
+    :param method: projection method, either 'MIP', 'Mean' or 'Sum', defaults to 'MIP'
+    :type method: str, optional
+    :param callback: called as callback(partial, done, total) after every
+    completed pass along the projection axis with a read-only array, defaults to None
+    :type callback: function, optional
+    :return: read-only projection with dimension order STZCYX, where the
+    projected axis has size 1, and the dimension string
+    :rtype: tuple(np.ndarray, str)
+    """
+
+    for result, done, total in iter_project_czi(filepath, axis=axis, method=method):
+        if callback is not None:
+            callback(result, done, total)
+
+    return result, PROJECTION_DIMSTRING
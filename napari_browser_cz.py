@@ -39,12 +39,14 @@ from PyQt5.QtGui import QFont
 
 import sys
 import napari
+from napari.qt.threading import thread_worker
 import numpy as np
 from czimetadata_tools import pylibczirw_metadata as czimd
 from czimetadata_tools import pylibczirw_tools
 from czimetadata_tools import napari_tools
 import os
 from zencontrol import ZenExperiment, ZenDocuments
+from czi_projections import iter_project_czi, PROJECTION_AXES, PROJECTION_METHODS
 from pathlib import Path
 
 
@@ -256,6 +258,151 @@ class StartExperiment(QWidget):
             open_image_stack(self.saved_czifilepath, use_dask=checkboxes.cbox_dask.isChecked())
 
 
+class ProjectionWidget(QWidget):
+
+    def __init__(self):
+
+        super(QWidget, self).__init__()
+
+        # filepath of the currently displayed image
+        self.filepath = None
+
+        # running projection, its napari layers and the hidden image stack layers
+        self.worker = None
+        self.layers = []
+        self.hidden_layers = []
+
+        # Create a grid layout instance
+        self.grid_proj = QGridLayout()
+        self.grid_proj.setSpacing(10)
+        self.setLayout(self.grid_proj)
+
+        # add widgets to select the projection method and axis
+        self.methodselect = QComboBox(self)
+        self.methodselect.addItems(PROJECTION_METHODS)
+        self.methodselect.setStyleSheet("font: bold;"
+                                        "font-size: 10px;"
+                                        )
+        self.grid_proj.addWidget(self.methodselect, 0, 0)
+
+        self.axisselect = QComboBox(self)
+        self.axisselect.addItems(PROJECTION_AXES)
+        self.axisselect.setStyleSheet("font: bold;"
+                                      "font-size: 10px;"
+                                      )
+        self.grid_proj.addWidget(self.axisselect, 0, 1)
+
+        self.projbutton = QPushButton('Calculate Projection')
+        self.projbutton.setStyleSheet("font: bold;"
+                                      "font-size: 10px;"
+                                      )
+        self.grid_proj.addWidget(self.projbutton, 0, 2)
+
+        self.projbutton.clicked.connect(self.on_click)
+
+    def on_click(self):
+
+        if self.filepath is None:
+            print('No image opened to calculate a projection.')
+            return
+
+        method = self.methodselect.currentText()
+        axis = self.axisselect.currentText()
+        print('Calculate', method, 'along', axis, 'for : ', self.filepath)
+
+        # remove the previous projection and show the image stack again
+        self.stop()
+
+        # hide the image stack, otherwise it is added to the projection
+        self.hidden_layers = [layer for layer in viewer.layers if layer.visible]
+        for layer in self.hidden_layers:
+            layer.visible = False
+
+        # use the same scaling as the image stack layers
+        scale = [layer.scale for layer in viewer.layers if layer.ndim == 5]
+        self.scale = scale[0] if scale else None
+        self.layername = method + '_' + axis
+
+        self.projbutton.setEnabled(False)
+        self.projbutton.setText('Running ...')
+
+        # read the planes in the background and show the partial results
+        worker = thread_worker(iter_project_czi)(self.filepath, axis=axis, method=method)
+        worker.yielded.connect(lambda data, worker=worker: self.show_progress(worker, data))
+        worker.errored.connect(lambda e, worker=worker: self.on_error(worker, e))
+        worker.finished.connect(lambda worker=worker: self.on_finished(worker))
+        self.worker = worker
+        worker.start()
+
+    def show_progress(self, worker, data):
+
+        # ignore results from a projection, which was already stopped
+        if worker is not self.worker:
+            return
+
+        partial, done, total = data
+
+        # one layer per channel - created with the first partial result
+        if not self.layers:
+            for c in range(partial.shape[3]):
+                layer = viewer.add_image(partial[:, :, :, c],
+                                         name=self.layername + ' CH' + str(c + 1),
+                                         scale=self.scale,
+                                         blending='additive',
+                                         gamma=0.85)
+                self.layers.append(layer)
+        else:
+            for c, layer in enumerate(self.layers):
+                layer.data = partial[:, :, :, c]
+
+        self.projbutton.setText('Running ... ' + str(done) + '/' + str(total))
+
+    def on_error(self, worker, e):
+
+        if worker is not self.worker:
+            return
+
+        print('Calculate Projection: Unexpected error:', e)
+        self.stop()
+
+    def on_finished(self, worker):
+
+        if worker is not self.worker:
+            return
+
+        for layer in self.layers:
+            layer.reset_contrast_limits()
+
+        self.worker = None
+        self.reset_button()
+
+    def stop(self):
+        """Stop a running projection, remove its layers and show the
+        image stack layers again.
+        """
+
+        if self.worker is not None:
+            self.worker.quit()
+            self.worker = None
+
+        for layer in self.layers:
+            if layer in viewer.layers:
+                viewer.layers.remove(layer)
+        self.layers = []
+
+        for layer in self.hidden_layers:
+            if layer in viewer.layers:
+                layer.visible = True
+        self.hidden_layers = []
+
+        self.reset_button()
+
+    def reset_button(self):
+
+        self.projbutton.setEnabled(True)
+        self.projbutton.setText('Calculate Projection')
+
+
 def open_image_stack(filepath, use_dask=False):
     """ Open a file using pylibCZIrw and display it inside napari
 
@@ -267,10 +414,16 @@ def open_image_stack(filepath, use_dask=False):
 
     if os.path.isfile(filepath):
 
+        # stop a running projection of the previous image
+        projection.stop()
+
         # remove existing layers from napari
         viewer.layers.select_all()
         viewer.layers.remove_selected()
 
+        # remember the current file for the projections
+        projection.filepath = filepath
+
         # get the complete metadata at once as one big class
         mdata = czimd.CziMetadata(filepath)
 
@@ -402,6 +555,7 @@ if __name__ == "__main__":
         # table for the metadata and for options
         mdbrowser = napari_tools.TableWidget()
         checkboxes = OptionsWidget()
+        projection = ProjectionWidget()
 
         # widget to start an experiment in ZEN remotely
         expselect = StartExperiment(expfiles_short,
@@ -413,6 +567,11 @@ if __name__ == "__main__":
                                                  name='checkbox',
                                                  area='bottom')
 
+        # add widget to calculate projections along Z or T
+        projwidget = viewer.window.add_dock_widget(projection,
+                                                   name='projection',
+                                                   area='bottom')
+
         # add the Table widget for the metadata
         mdwidget = viewer.window.add_dock_widget(mdbrowser,
                                                  name='mdbrowser',
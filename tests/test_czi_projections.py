@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import os
+import numpy as np
+import pytest
+
+pyczi = pytest.importorskip('pylibCZIrw.czi')
+
+import czi_projections
+from czi_projections import project_czi, iter_project_czi, clear_projection_cache
+
+TESTFILE = os.path.join(os.path.dirname(__file__), '..', 'testdata',
+                        'CellDivision_T=3_Z=5_CH=2_X=240_X=170.czi')
+
+REDUCTIONS = {'MIP': np.max, 'Mean': np.mean, 'Sum': np.sum}
+
+# axis index inside the STZCYX array
+AXIS_INDEX = {'T': 1, 'Z': 2}
+
+
+@pytest.fixture(scope='module')
+def stack():
+    """Read the complete test stack as STZCYX array.
+    """
+
+    with pyczi.open_czi(TESTFILE) as czidoc:
+        bbox = czidoc.total_bounding_box
+        stack = np.stack([np.stack([np.stack([czidoc.read(plane={'T': t, 'Z': z, 'C': c})[..., 0]
+                                              for c in range(*bbox['C'])])
+                                    for z in range(*bbox['Z'])])
+                          for t in range(*bbox['T'])])
+
+    return stack[np.newaxis]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+
+    clear_projection_cache()
+    yield
+    clear_projection_cache()
+
+
+@pytest.mark.parametrize('axis', ['Z', 'T'])
+@pytest.mark.parametrize('method', ['MIP', 'Mean', 'Sum'])
+def test_project(stack, axis, method):
+
+    result, dimstring = project_czi(TESTFILE, axis=axis, method=method)
+    expected = REDUCTIONS[method](stack, axis=AXIS_INDEX[axis], keepdims=True)
+
+    assert dimstring == 'STZCYX'
+    assert result.shape == expected.shape
+    assert result.shape[AXIS_INDEX[axis]] == 1
+    if method == 'MIP':
+        assert result.dtype == stack.dtype
+        np.testing.assert_array_equal(result, expected)
+    else:
+        assert result.dtype == np.float64
+        np.testing.assert_allclose(result, expected)
+
+
+def test_partial_mean(stack):
+
+    total = stack.shape[2]
+
+    for k, (partial, done, n) in enumerate(iter_project_czi(TESTFILE, axis='Z', method='Mean')):
+        assert (done, n) == (k + 1, total)
+        assert not partial.flags.writeable
+        np.testing.assert_allclose(partial, stack[:, :, :k + 1].mean(axis=2, keepdims=True))
+
+    assert done == total
+
+
+def test_partial_mip(stack):
+
+    for k, (partial, done, n) in enumerate(iter_project_czi(TESTFILE, axis='T', method='MIP')):
+        assert partial.shape == stack.shape[:1] + (1,) + stack.shape[2:]
+        np.testing.assert_array_equal(partial, stack[:, :k + 1].max(axis=1, keepdims=True))
+
+
+def test_cache():
+
+    progress = []
+
+    result, dimstring = project_czi(TESTFILE, axis='Z', method='Mean',
+                                    callback=lambda partial, done, total: progress.append((done, total)))
+    assert progress == [(k + 1, 5) for k in range(5)]
+    assert not result.flags.writeable
+
+    # the 2nd call is served from the cache
+    cached, dimstring = project_czi(TESTFILE, axis='Z', method='Mean')
+    assert cached is result
+
+
+def test_cache_size(monkeypatch):
+
+    monkeypatch.setattr(czi_projections, 'PROJECTION_CACHE_SIZE', 2)
+
+    for method in ['MIP', 'Mean', 'Sum']:
+        project_czi(TESTFILE, axis='Z', method=method)
+
+    assert len(czi_projections._projection_cache) == 2